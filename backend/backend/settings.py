@@ -3,6 +3,7 @@ Django settings for backend project.
 """
 
 import os
+import orjson
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -32,6 +33,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -115,6 +117,13 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'djangorestframework_camel_case.parser.CamelCaseJSONParser',
     ],
+    # DRF keys ListField errors by item index, which orjson rejects by default
+    'ORJSON_RENDERER_OPTIONS': (orjson.OPT_NON_STR_KEYS,),
+}
+
+# Render the camelCased responses with orjson instead of the stdlib json encoder
+JSON_CAMEL_CASE = {
+    'RENDERER_CLASS': 'drf_orjson_renderer.renderers.ORJSONRenderer',
 }
 
 # CORS settings
@@ -14,6 +14,7 @@ class TripAdmin(admin.ModelAdmin):
     list_display = ['id', 'driver', 'pickup_location', 'dropoff_location', 'status', 'created_at']
     list_filter = ['status', 'created_at']
     search_fields = ['pickup_location', 'dropoff_location', 'driver__name']
+    list_select_related = ['driver']
 
 
 @admin.register(EldLog)
@@ -21,10 +22,12 @@ class EldLogAdmin(admin.ModelAdmin):
     list_display = ['id', 'driver', 'log_date', 'total_miles', 'is_compliant', 'created_at']
     list_filter = ['is_compliant', 'log_date', 'created_at']
     search_fields = ['driver__name']
+    list_select_related = ['driver', 'trip']
 
 
 @admin.register(HosViolation)
 class HosViolationAdmin(admin.ModelAdmin):
     list_display = ['id', 'driver', 'violation_type', 'severity', 'resolved', 'timestamp']
     list_filter = ['violation_type', 'severity', 'resolved', 'timestamp']
-    search_fields = ['driver__name', 'description']
\ No newline at end of file
+    search_fields = ['driver__name', 'description']
+    list_select_related = ['driver']
\ No newline at end of file
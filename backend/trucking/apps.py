@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class TruckingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'trucking'
\ No newline at end of file
+    name = 'trucking'
+
+    def ready(self):
+        from . import signals  # noqa: F401
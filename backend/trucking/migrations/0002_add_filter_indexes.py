@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-15 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trucking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eldlog',
+            index=models.Index(fields=['driver', '-log_date'], name='eld_logs_driver_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eldlog',
+            index=models.Index(fields=['is_compliant', '-log_date'], name='eld_logs_compliant_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hosviolation',
+            index=models.Index(fields=['resolved', 'severity', '-timestamp'], name='hos_viol_open_severity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hosviolation',
+            index=models.Index(fields=['violation_type'], name='hos_viol_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['driver', 'status', '-created_at'], name='trips_driver_status_idx'),
+        ),
+    ]
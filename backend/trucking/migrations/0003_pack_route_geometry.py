@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-15 11:03
+
+from array import array
+
+from django.db import migrations, models
+
+COORDINATE_SCALE = 10 ** 6
+
+
+def pack_existing_geometry(apps, schema_editor):
+    Trip = apps.get_model('trucking', 'Trip')
+    for trip in Trip.objects.filter(route_data__has_key='coordinates').iterator():
+        coordinates = trip.route_data.pop('coordinates') or []
+        trip.route_geometry_packed = array(
+            'i', (round(value * COORDINATE_SCALE) for point in coordinates for value in point)
+        ).tobytes()
+        trip.save(update_fields=['route_data', 'route_geometry_packed'])
+
+
+def unpack_existing_geometry(apps, schema_editor):
+    Trip = apps.get_model('trucking', 'Trip')
+    for trip in Trip.objects.filter(route_geometry_packed__isnull=False).iterator():
+        values = array('i')
+        values.frombytes(trip.route_geometry_packed)
+        trip.route_data = {
+            **(trip.route_data or {}),
+            'coordinates': [
+                [values[i] / COORDINATE_SCALE, values[i + 1] / COORDINATE_SCALE]
+                for i in range(0, len(values), 2)
+            ],
+        }
+        trip.save(update_fields=['route_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trucking', '0002_add_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trip',
+            name='route_geometry_packed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_existing_geometry, unpack_existing_geometry),
+    ]
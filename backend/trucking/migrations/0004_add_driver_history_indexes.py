@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trucking', '0003_pack_route_geometry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hosviolation',
+            index=models.Index(condition=models.Q(('resolved', False)), fields=['driver', '-timestamp'], name='hos_viol_driver_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['driver', '-created_at'], name='trips_driver_created_idx'),
+        ),
+    ]
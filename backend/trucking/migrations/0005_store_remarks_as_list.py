@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 11:12
+
+from django.db import migrations, models
+
+
+def split_existing_remarks(apps, schema_editor):
+    EldLog = apps.get_model('trucking', 'EldLog')
+    for log in EldLog.objects.exclude(remarks='').only('remarks').iterator():
+        log.remarks_lines = log.remarks.split('\n')
+        log.save(update_fields=['remarks_lines'])
+
+
+def join_existing_remarks(apps, schema_editor):
+    EldLog = apps.get_model('trucking', 'EldLog')
+    for log in EldLog.objects.only('remarks_lines').iterator():
+        lines = log.remarks_lines or []
+        log.remarks = '\n'.join(lines) if isinstance(lines, list) else str(lines)
+        log.save(update_fields=['remarks'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trucking', '0004_add_driver_history_indexes'),
+    ]
+
+    # The text column holds newline-joined lines that aren't valid JSON, so it can't be
+    # cast in place; copy into a new column, drop the old one and take over its name.
+    operations = [
+        migrations.AddField(
+            model_name='eldlog',
+            name='remarks_lines',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(split_existing_remarks, join_existing_remarks),
+        migrations.RemoveField(
+            model_name='eldlog',
+            name='remarks',
+        ),
+        migrations.RenameField(
+            model_name='eldlog',
+            old_name='remarks_lines',
+            new_name='remarks',
+        ),
+    ]
@@ -39,7 +39,8 @@ class Trip(models.Model):
     estimated_weight = models.IntegerField(default=80000)
     total_distance = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
     estimated_duration = models.IntegerField(null=True, blank=True)  # in minutes
-    route_data = models.JSONField(null=True, blank=True)  # stores route coordinates and stops
+    route_data = models.JSONField(null=True, blank=True)  # stores route totals and stops
+    route_geometry_packed = models.BinaryField(null=True, blank=True)  # packed route coordinates, see services.pack_coordinates
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -49,6 +50,10 @@ class Trip(models.Model):
 
     class Meta:
         db_table = 'trips'
+        indexes = [
+            models.Index(fields=['driver', 'status', '-created_at'], name='trips_driver_status_idx'),
+            models.Index(fields=['driver', '-created_at'], name='trips_driver_created_idx'),
+        ]
 
 
 class EldLog(models.Model):
@@ -63,16 +68,22 @@ class EldLog(models.Model):
     off_duty_time = models.IntegerField(default=0)  # in minutes
     sleeper_berth_time = models.IntegerField(default=0)  # in minutes
     time_entries = models.JSONField()  # hour-by-hour status entries
-    remarks = models.TextField(blank=True)
+    remarks = models.JSONField(default=list, blank=True)  # list of remark lines
     is_compliant = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
-        return f"ELD Log {self.log_date.date()} - {self.driver.name}"
+        # Don't issue a query just to label the row; fall back to the driver's id
+        driver = self.driver.name if EldLog.driver.is_cached(self) else self.driver_id
+        return f"ELD Log {self.log_date.date()} - {driver}"
 
     class Meta:
         db_table = 'eld_logs'
         ordering = ['-log_date']
+        indexes = [
+            models.Index(fields=['driver', '-log_date'], name='eld_logs_driver_date_idx'),
+            models.Index(fields=['is_compliant', '-log_date'], name='eld_logs_compliant_date_idx'),
+        ]
 
 
 class HosViolation(models.Model):
@@ -98,8 +109,19 @@ class HosViolation(models.Model):
     resolved = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"{self.violation_type} - {self.driver.name} ({self.severity})"
+        driver = self.driver.name if HosViolation.driver.is_cached(self) else self.driver_id
+        return f"{self.violation_type} - {driver} ({self.severity})"
 
     class Meta:
         db_table = 'hos_violations'
-        ordering = ['-timestamp']
\ No newline at end of file
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['resolved', 'severity', '-timestamp'], name='hos_viol_open_severity_idx'),
+            models.Index(fields=['violation_type'], name='hos_viol_type_idx'),
+            # Open violations per driver, newest first; resolved rows never need this index
+            models.Index(
+                fields=['driver', '-timestamp'],
+                name='hos_viol_driver_open_idx',
+                condition=models.Q(resolved=False),
+            ),
+        ]
\ No newline at end of file
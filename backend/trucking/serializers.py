@@ -2,11 +2,31 @@
 Django REST Framework serializers for the trucking application.
 """
 
+import copy
+
 from rest_framework import serializers
 from .models import Driver, Trip, EldLog, HosViolation
 
 
-class DriverSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """Build a serializer's fields once per class and hand out shallow copies.
+
+    ModelSerializer.get_fields() deep-copies the declared fields and rebuilds
+    the model fields on every instantiation, which dominates serialization
+    time on list endpoints. Our field sets are static, so the result can be
+    reused across instances.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            fields = self._fields_cache[cls] = super().get_fields()
+        return {name: copy.copy(field) for name, field in fields.items()}
+
+
+class DriverSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Driver model"""
     
     class Meta:
@@ -15,7 +35,7 @@ class DriverSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class TripSerializer(serializers.ModelSerializer):
+class TripSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Trip model"""
     driver_id = serializers.UUIDField(write_only=True)
     driver = DriverSerializer(read_only=True)
@@ -30,12 +50,21 @@ class TripSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class EldLogSerializer(serializers.ModelSerializer):
+class TripListSerializer(TripSerializer):
+    """Serializer for Trip lists; leaves out the route data"""
+    
+    class Meta(TripSerializer.Meta):
+        fields = [field for field in TripSerializer.Meta.fields if field != 'route_data']
+
+
+class EldLogSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for ELD Log model"""
     driver_id = serializers.UUIDField(write_only=True)
     trip_id = serializers.UUIDField(write_only=True, required=False)
     driver = DriverSerializer(read_only=True)
     trip = TripSerializer(read_only=True)
+    # Stored as a JSON list of lines; the model field alone would accept any JSON
+    remarks = serializers.ListField(child=serializers.CharField(allow_blank=True), required=False)
     
     class Meta:
         model = EldLog
@@ -47,7 +76,15 @@ class EldLogSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class HosViolationSerializer(serializers.ModelSerializer):
+class EldLogListSerializer(EldLogSerializer):
+    """Serializer for ELD Log lists; leaves out the hourly entries and remarks"""
+    trip = TripListSerializer(read_only=True)
+    
+    class Meta(EldLogSerializer.Meta):
+        fields = [field for field in EldLogSerializer.Meta.fields if field not in ('time_entries', 'remarks')]
+
+
+class HosViolationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for HOS Violation model"""
     driver_id = serializers.UUIDField(write_only=True)
     trip_id = serializers.UUIDField(write_only=True, required=False)
@@ -73,10 +110,5 @@ class TripCalculationSerializer(serializers.Serializer):
     driver_id = serializers.UUIDField()
 
 
-class HOSStatusSerializer(serializers.Serializer):
-    """Serializer for HOS status response"""
-    drive_time_left = serializers.CharField()
-    on_duty_left = serializers.CharField()
-    cycle_used = serializers.CharField()
-    next_break = serializers.CharField()
-    is_compliant = serializers.BooleanField()
\ No newline at end of file
+# Stateless, so one bound instance can validate every request via run_validation()
+TRIP_CALC_SERIALIZER = TripCalculationSerializer()
\ No newline at end of file
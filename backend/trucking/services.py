@@ -3,12 +3,100 @@ Business logic services for the trucking application.
 Converted from TypeScript services.
 """
 
+import hashlib
+from array import array
 import json
+import math
+import sys
+import threading
+import time
+import orjson
 import requests
-from typing import List, Dict, Any, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import namedtuple
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Sequence, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from django.core.cache import cache
+
+# Geocodes and routes between fixed points rarely change
+GEOCODE_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+ROUTE_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_MIN_INTERVAL = 1.0
+
+# Matches the dashboard poll interval; writes invalidate the entry sooner
+HOS_STATUS_CACHE_TIMEOUT = 30
+
+# Duty statuses used in time_entries. Entries built by ELDLogGenerator share these
+# objects, so comparisons against them hit the identity fast path of str ==.
+_DRIVING = sys.intern('driving')
+_ON_DUTY = sys.intern('on-duty')
+_OFF_DUTY = sys.intern('off-duty')
+
+# Per-day totals in hours; on_duty_hours includes driving hours
+HOSTally = namedtuple('HOSTally', 'driving_hours on_duty_hours current_driving_run longest_driving_run')
+
+# One day's log from ELDLogGenerator, with the fields an EldLog row is built from
+EldLogDraft = namedtuple(
+    'EldLogDraft',
+    'date daily_miles driving_time on_duty_time off_duty_time sleeper_berth_time time_entries remarks is_compliant'
+)
+
+# OSRM returns coordinates with 6 decimal places (1e6 fixed point), so they pack exactly
+# as scaled int32; ±180e6 is well inside the int32 range
+COORDINATE_SCALE = 10 ** 6
+
+
+def hos_status_cache_key(driver_id) -> str:
+    """Cache key for a driver's computed HOS status"""
+    return f'hos:{driver_id}'
+
+
+def _geocode_cache_key(location: str) -> str:
+    """Cache key for a geocode; case and surrounding whitespace don't matter"""
+    return 'geo:' + hashlib.sha1(location.strip().lower().encode()).hexdigest()
+
+
+def pack_coordinates(coordinates: List[List[float]]) -> bytes:
+    """Pack [lon, lat] pairs into a compact int32 byte string"""
+    return array('i', (round(value * COORDINATE_SCALE) for point in coordinates for value in point)).tobytes()
+
+
+def unpack_coordinates(packed: bytes) -> List[List[float]]:
+    """Unpack a byte string from pack_coordinates back into [lon, lat] pairs"""
+    values = array('i')
+    values.frombytes(packed)
+    return [[values[i] / COORDINATE_SCALE, values[i + 1] / COORDINATE_SCALE] for i in range(0, len(values), 2)]
+
+
+class RouteCalculationError(Exception):
+    """Route calculation failed; subclasses carry the message shown to the user"""
+    title = "Failed to calculate route"
+    user_message = "Please check your locations and try again"
+
+
+class GeocodingFailed(RouteCalculationError):
+    """The geocoding service could not be reached or gave an unusable answer"""
+    title = "Address lookup service temporarily unavailable"
+    user_message = "Our address lookup service is temporarily busy. Please try again in a moment or use major city names."
+
+
+class LocationNotFound(GeocodingFailed):
+    """The geocoding service has no match for a location"""
+    title = "Location not found"
+    user_message = "One or more locations could not be found. Please check spelling and try common city names."
+
+
+class NoRouteFound(RouteCalculationError):
+    """OSRM found no driving route between the waypoints"""
+    title = "No route available"
+    user_message = "No driving route could be found between these locations. Please check the addresses."
+
 
 class RouteCalculator:
     """Handles route calculation using external mapping services"""
@@ -16,55 +104,103 @@ class RouteCalculator:
     def __init__(self):
         self.osrm_base_url = "https://router.project-osrm.org"
         self.nominatim_base_url = "https://nominatim.openstreetmap.org"
+        
+        # Reuse TCP/TLS connections across the geocoding and routing calls. One instance
+        # serves every request thread: the session's headers and adapters are only set
+        # here, urllib3's connection pool is thread-safe and the cookie jar locks itself.
+        self._session = requests.Session()
+        self._session.headers.update({'User-Agent': 'TruckRoute-Pro/1.0'})
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        ))
+        
+        # Serializes Nominatim calls from all threads in this process and spaces them out
+        self._nominatim_lock = threading.Lock()
+        self._last_nominatim_call = 0.0
     
     def geocode_location(self, location: str) -> Tuple[float, float]:
         """Convert location string to coordinates"""
+        cache_key = _geocode_cache_key(location)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return self._geocode_uncached(location, cache_key)
+    
+    def _geocode_uncached(self, location: str, cache_key: str) -> Tuple[float, float]:
+        """Look a location up on Nominatim and cache the result"""
         try:
-            response = requests.get(
-                f"{self.nominatim_base_url}/search",
-                params={
-                    'q': location,
-                    'format': 'json',
-                    'limit': 1
-                },
-                headers={'User-Agent': 'TruckRoute-Pro/1.0'},
-                timeout=10
-            )
+            with self._nominatim_lock:
+                wait = self._last_nominatim_call + NOMINATIM_MIN_INTERVAL - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    response = self._session.get(
+                        f"{self.nominatim_base_url}/search",
+                        params={
+                            'q': location,
+                            'format': 'json',
+                            'limit': 1
+                        },
+                        timeout=10
+                    )
+                finally:
+                    self._last_nominatim_call = time.monotonic()
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if not data:
-                raise Exception(f"Could not find location: {location}")
+                raise LocationNotFound(f"Could not find location: {location}")
             
-            return float(data[0]['lat']), float(data[0]['lon'])
+            coords = float(data[0]['lat']), float(data[0]['lon'])
+            cache.set(cache_key, coords, GEOCODE_CACHE_TIMEOUT)
+            return coords
+        except LocationNotFound:
+            raise
         except Exception as e:
-            raise Exception(f"Geocoding failed for {location}: {str(e)}")
+            raise GeocodingFailed(f"Geocoding failed for {location}: {str(e)}") from e
     
     def calculate_route(self, current_location: str, pickup_location: str, dropoff_location: str) -> Dict[str, Any]:
         """Calculate route between locations with stops"""
+        # Waypoint order matters, so the key keeps the locations in sequence
+        cache_key = 'route:' + hashlib.sha1(
+            '\x1f'.join((current_location, pickup_location, dropoff_location)).encode()
+        ).hexdigest()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Geocode all locations
-            current_coords = self.geocode_location(current_location)
-            pickup_coords = self.geocode_location(pickup_location)
-            dropoff_coords = self.geocode_location(dropoff_location)
+            # Read every cached geocode in one round trip, then look up each distinct miss
+            # in turn; Nominatim's rate limit rules out parallel requests
+            locations = (current_location, pickup_location, dropoff_location)
+            geo_keys = [_geocode_cache_key(location) for location in locations]
+            coords = cache.get_many(geo_keys)
+            for geo_key, location in dict(zip(geo_keys, locations)).items():
+                if geo_key not in coords:
+                    coords[geo_key] = self._geocode_uncached(location, geo_key)
+            current_coords, pickup_coords, dropoff_coords = (coords[geo_key] for geo_key in geo_keys)
             
             # Calculate route from current to pickup to dropoff
             waypoints = f"{current_coords[1]},{current_coords[0]};{pickup_coords[1]},{pickup_coords[0]};{dropoff_coords[1]},{dropoff_coords[0]}"
             
-            response = requests.get(
+            response = self._session.get(
                 f"{self.osrm_base_url}/route/v1/driving/{waypoints}",
+                # Only the overview geometry, distance and duration are used, so skip
+                # turn-by-turn steps and let OSRM simplify the line for display
                 params={
-                    'overview': 'full',
+                    'overview': 'simplified',
                     'geometries': 'geojson',
-                    'steps': 'true'
+                    'steps': 'false'
                 },
                 timeout=15
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('code') != 'Ok' or not data.get('routes'):
-                raise Exception("No route found between locations")
+                raise NoRouteFound("No route found between locations")
             
             route = data['routes'][0]
             geometry = route['geometry']['coordinates']
@@ -80,15 +216,20 @@ class RouteCalculator:
                 total_distance, total_duration
             )
             
-            return {
+            route_data = {
                 'coordinates': geometry,
                 'total_distance': round(total_distance, 2),
                 'estimated_duration': round(total_duration),
                 'stops': stops
             }
             
+        except RouteCalculationError:
+            raise
         except Exception as e:
-            raise Exception(f"Route calculation failed: {str(e)}")
+            raise RouteCalculationError(f"Route calculation failed: {str(e)}") from e
+        
+        cache.set(cache_key, route_data, ROUTE_CACHE_TIMEOUT)
+        return route_data
     
     def _generate_stops(self, current_location: str, pickup_location: str, dropoff_location: str,
                        current_coords: Tuple[float, float], pickup_coords: Tuple[float, float], 
@@ -161,9 +302,23 @@ class HOSCalculator:
     
     def calculate_hos_status(self, time_entries: List[Dict[str, Any]], current_cycle_hours: float) -> Dict[str, Any]:
         """Calculate current HOS status"""
+        # Dashboards poll with unchanged entries, so results are memoized on the hourly
+        # statuses. Cycle hours arrive as Decimal from the model; float is plenty here.
+        # time_entries isn't validated, so anything other than a string status (which
+        # could be unhashable) counts as None, the same as an entry with no status.
+        statuses = tuple(
+            status if isinstance(status, str) else None
+            for status in (entry.get('status') for entry in time_entries)
+        )
+        return dict(_memoized_hos_status(statuses, float(current_cycle_hours)))
+    
+    def _calculate_hos_status(self, statuses: Tuple[str, ...], current_cycle_hours: float) -> Dict[str, Any]:
+        """Calculate HOS status from the hourly statuses of a day"""
+        tally = self._tally(statuses)
+        
         # Calculate time used today
-        driving_minutes = sum(1 for entry in time_entries if entry.get('status') == 'driving') * 60
-        on_duty_minutes = sum(1 for entry in time_entries if entry.get('status') in ['driving', 'on-duty']) * 60
+        driving_minutes = tally.driving_hours * 60
+        on_duty_minutes = tally.on_duty_hours * 60
         
         # Calculate remaining time
         drive_time_left_minutes = max(0, 11 * 60 - driving_minutes)
@@ -173,13 +328,8 @@ class HOSCalculator:
         cycle_used_hours = current_cycle_hours + (on_duty_minutes / 60)
         cycle_remaining = max(0, 70 - cycle_used_hours)
         
-        # Determine next break requirement
-        continuous_driving = 0
-        for entry in time_entries:
-            if entry.get('status') == 'driving':
-                continuous_driving += 1
-            else:
-                continuous_driving = 0
+        # Determine next break requirement from the driving run we are still in
+        continuous_driving = tally.current_driving_run
         
         next_break_minutes = max(0, 8 * 60 - continuous_driving * 60)
         
@@ -203,9 +353,12 @@ class HOSCalculator:
         """Check for HOS violations"""
         violations = []
         
+        current_cycle_hours = float(current_cycle_hours)
+        tally = self._tally([entry.get('status') for entry in time_entries])
+        
         # Count time usage
-        driving_minutes = sum(1 for entry in time_entries if entry.get('status') == 'driving') * 60
-        on_duty_minutes = sum(1 for entry in time_entries if entry.get('status') in ['driving', 'on-duty']) * 60
+        driving_minutes = tally.driving_hours * 60
+        on_duty_minutes = tally.on_duty_hours * 60
         cycle_used_hours = current_cycle_hours + (on_duty_minutes / 60)
         
         # Check 11-hour driving limit
@@ -233,14 +386,7 @@ class HOSCalculator:
             })
         
         # Check 8-hour driving without break
-        continuous_driving = 0
-        max_continuous = 0
-        for entry in time_entries:
-            if entry.get('status') == 'driving':
-                continuous_driving += 1
-                max_continuous = max(max_continuous, continuous_driving)
-            else:
-                continuous_driving = 0
+        max_continuous = tally.longest_driving_run
         
         if max_continuous > 8:
             violations.append({
@@ -251,6 +397,23 @@ class HOSCalculator:
         
         return violations
     
+    def _tally(self, statuses: Sequence[str]) -> HOSTally:
+        """Count duty hours and driving runs in a single pass over the statuses"""
+        driving_hours = on_duty_hours = 0
+        current_run = longest_run = 0
+        for status in statuses:
+            if status == _DRIVING:
+                driving_hours += 1
+                current_run += 1
+                if current_run > longest_run:
+                    longest_run = current_run
+            else:
+                current_run = 0
+                if status == _ON_DUTY:
+                    on_duty_hours += 1
+        
+        return HOSTally(driving_hours, driving_hours + on_duty_hours, current_run, longest_run)
+    
     def _format_time(self, minutes: int) -> str:
         """Format minutes to hours and minutes string"""
         hours = minutes // 60
@@ -258,60 +421,60 @@ class HOSCalculator:
         return f"{hours}h {mins:02d}m"
 
 
+@lru_cache(maxsize=1024)
+def _memoized_hos_status(statuses: Tuple[str, ...], current_cycle_hours: float) -> Dict[str, Any]:
+    """Shared cache behind HOSCalculator.calculate_hos_status; callers must copy the result"""
+    return HOSCalculator()._calculate_hos_status(statuses, current_cycle_hours)
+
+
 class ELDLogGenerator:
     """Generates Electronic Logging Device logs"""
     
-    def generate_log_for_trip(self, start_time: datetime, distance_miles: float, driving_hours: float) -> Dict[str, Any]:
+    def generate_log_for_trip(self, start_time: datetime, distance_miles: float, driving_hours: float) -> EldLogDraft:
         """Generate a single day ELD log"""
-        time_entries = []
-        remarks = []
-        
         current_hour = start_time.hour
         driving_time = int(driving_hours * 60)  # Convert to minutes
         on_duty_time = driving_time + 120  # Add 2 hours for pickup/dropoff
         off_duty_time = 24 * 60 - on_duty_time  # Rest of day off duty
         
-        # Generate hourly entries
-        for hour in range(24):
-            if hour < current_hour:
-                status = 'off-duty'
-            elif hour < current_hour + 1:  # First hour - pickup
-                status = 'on-duty'
-                if hour == current_hour:
-                    remarks.append(f"{hour:02d}:00 - Begin pickup activities")
-            elif hour < current_hour + 1 + driving_hours:  # Driving hours
-                status = 'driving'
-                if hour == current_hour + 1:
-                    remarks.append(f"{hour:02d}:00 - Begin driving")
-            elif hour < current_hour + 1 + driving_hours + 1:  # Final hour - dropoff
-                status = 'on-duty'
-                if hour == int(current_hour + 1 + driving_hours):
-                    remarks.append(f"{hour:02d}:00 - Begin dropoff activities")
-            else:
-                status = 'off-duty'
-                if hour == int(current_hour + 1 + driving_hours + 1):
-                    remarks.append(f"{hour:02d}:00 - Off duty")
-            
-            time_entries.append({
-                'hour': hour,
-                'status': status
-            })
+        # Hour boundaries of the day: pickup hour, driving, dropoff hour, then off duty.
+        # A partial driving hour is logged as a full one.
+        drive_start = current_hour + 1
+        dropoff_start = drive_start + math.ceil(driving_hours)
+        off_duty_start = dropoff_start + 1
         
-        return {
-            'time_entries': time_entries,
-            'driving_time': driving_time,
-            'on_duty_time': on_duty_time,
-            'off_duty_time': off_duty_time,
-            'sleeper_berth_time': 0,
-            'remarks': remarks,
-            'is_compliant': driving_hours <= 11 and on_duty_time <= 14 * 60
-        }
+        # Build hourly entries segment by segment, clipped to the 24 hours of the day
+        statuses = (
+            [_OFF_DUTY] * current_hour
+            + [_ON_DUTY]
+            + [_DRIVING] * (dropoff_start - drive_start)
+            + [_ON_DUTY]
+        )[:24]
+        statuses += [_OFF_DUTY] * (24 - len(statuses))
+        time_entries = [{'hour': hour, 'status': status} for hour, status in enumerate(statuses)]
+        
+        boundaries = [(current_hour, 'Begin pickup activities')]
+        if dropoff_start > drive_start:
+            boundaries.append((drive_start, 'Begin driving'))
+        boundaries += [(dropoff_start, 'Begin dropoff activities'), (off_duty_start, 'Off duty')]
+        remarks = [f"{hour:02d}:00 - {remark}" for hour, remark in boundaries if hour < 24]
+        
+        return EldLogDraft(
+            date=start_time,
+            daily_miles=round(distance_miles, 2),
+            driving_time=driving_time,
+            on_duty_time=on_duty_time,
+            off_duty_time=off_duty_time,
+            sleeper_berth_time=0,
+            time_entries=time_entries,
+            remarks=remarks,
+            is_compliant=driving_hours <= 11 and on_duty_time <= 14 * 60
+        )
     
     def generate_multi_day_logs(self, start_time: datetime, total_distance: float, 
                                total_driving_hours: float, pickup_location: str, 
-                               dropoff_location: str) -> List[Dict[str, Any]]:
-        """Generate multiple day ELD logs for long trips"""
-        logs = []
+                               dropoff_location: str) -> Iterator[EldLogDraft]:
+        """Generate multiple day ELD logs for long trips, one day at a time"""
         current_date = start_time
         remaining_hours = total_driving_hours
         remaining_distance = total_distance
@@ -322,13 +485,7 @@ class ELDLogGenerator:
             daily_driving_hours = min(11, remaining_hours)
             daily_distance = (daily_driving_hours / total_driving_hours) * total_distance
             
-            log_data = self.generate_log_for_trip(current_date, daily_distance, daily_driving_hours)
-            
-            logs.append({
-                'date': current_date,
-                'daily_miles': round(daily_distance, 2),
-                **log_data
-            })
+            yield self.generate_log_for_trip(current_date, daily_distance, daily_driving_hours)
             
             remaining_hours -= daily_driving_hours
             remaining_distance -= daily_distance
@@ -339,8 +496,6 @@ class ELDLogGenerator:
             if remaining_hours > 0:
                 # Next day starts after 10-hour break
                 current_date = current_date.replace(hour=max(0, (current_date.hour + 10) % 24))
-        
-        return logs
     
     def export_to_pdf_data(self, log_data: Dict[str, Any], driver_name: str) -> Dict[str, Any]:
         """Export log data in format suitable for PDF generation"""
@@ -0,0 +1,23 @@
+"""
+Signal handlers for the trucking application.
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Driver, EldLog
+from .services import hos_status_cache_key
+
+
+@receiver(post_save, sender=EldLog)
+@receiver(post_delete, sender=EldLog)
+def invalidate_hos_status_for_log(sender, instance, **kwargs):
+    """A changed log can change the driver's HOS status"""
+    cache.delete(hos_status_cache_key(instance.driver_id))
+
+
+@receiver(post_save, sender=Driver)
+def invalidate_hos_status_for_driver(sender, instance, **kwargs):
+    """The HOS status includes the driver's cycle hours"""
+    cache.delete(hos_status_cache_key(instance.pk))
@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from .models import Driver
+from .services import HOSCalculator, pack_coordinates, unpack_coordinates
+
+
+class PackCoordinatesTests(SimpleTestCase):
+    def test_round_trips_osrm_coordinates_exactly(self):
+        coordinates = [[-87.629798, 41.878114], [-96.796988, 32.776664], [180.0, -90.0], [-180.0, 90.0]]
+        self.assertEqual(unpack_coordinates(pack_coordinates(coordinates)), coordinates)
+
+    def test_empty(self):
+        self.assertEqual(unpack_coordinates(pack_coordinates([])), [])
+
+
+class HOSStatusTests(SimpleTestCase):
+    def test_non_string_status_is_treated_as_no_status(self):
+        entries = [{'hour': 0, 'status': ['driving']}, {'hour': 1, 'status': 'driving'}]
+        status = HOSCalculator().calculate_hos_status(entries, 10)
+        self.assertEqual(status, HOSCalculator().calculate_hos_status([{'hour': 0}, entries[1]], 10))
+        self.assertEqual(status['drive_time_left'], '10h 00m')
+
+
+class EldLogApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='dispatcher'))
+        self.driver = Driver.objects.create(name='Test Driver', license_number='TD-1', current_cycle_hours=0)
+
+    def test_invalid_remarks_item_is_a_400(self):
+        response = self.client.post('/api/logs/', {
+            'driver_id': str(self.driver.id),
+            'log_date': '2026-01-01T00:00:00Z',
+            'time_entries': [],
+            'remarks': ['ok', {'a': 1}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'remarks': {'1': ['Not a valid string.']}})
+
+    def test_hos_status_with_non_string_status(self):
+        self.client.post('/api/logs/', {
+            'driver_id': str(self.driver.id),
+            'log_date': '2026-01-01T00:00:00Z',
+            'time_entries': [{'hour': 0, 'status': ['driving']}],
+        }, format='json')
+        response = self.client.get(f'/api/drivers/{self.driver.id}/hos-status/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['driveTimeLeft'], '11h 00m')
@@ -3,47 +3,93 @@ Django REST Framework views for the trucking application.
 Converted from Express.js routes.
 """
 
-from rest_framework import viewsets, status
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from datetime import datetime
+from django.utils.dateparse import parse_datetime
+from functools import lru_cache
 
 from .models import Driver, Trip, EldLog, HosViolation
 from .serializers import (
-    DriverSerializer, TripSerializer, EldLogSerializer, 
-    HosViolationSerializer, TripCalculationSerializer, HOSStatusSerializer
+    DriverSerializer, TripSerializer, TripListSerializer, EldLogSerializer, 
+    EldLogListSerializer, HosViolationSerializer, TRIP_CALC_SERIALIZER
 )
-from .services import RouteCalculator, HOSCalculator, ELDLogGenerator
+from .services import (
+    RouteCalculator, RouteCalculationError, HOSCalculator, ELDLogGenerator, HOS_STATUS_CACHE_TIMEOUT,
+    hos_status_cache_key, pack_coordinates, unpack_coordinates
+)
+
+# Services hold no per-request state, so one instance of each serves every request.
+# Sharing the RouteCalculator also shares its pooled HTTP session across requests.
+_ROUTE_CALC = RouteCalculator()
+_HOS_CALC = HOSCalculator()
+_ELD_GEN = ELDLogGenerator()
+
+# Columns EldLogListSerializer never reads; the full log is served by detail and pdf
+LOG_LIST_DEFERRED_FIELDS = ('time_entries', 'remarks', 'trip__route_data', 'trip__route_geometry_packed')
+
+
+def _query_flag(request, name):
+    """Whether a boolean query param is switched on, e.g. ?summary=1 or ?summary=true"""
+    return request.query_params.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+@lru_cache(maxsize=1024)
+def _parse_dt(value):
+    """Parse an ISO 8601 query param, returning None when it isn't a valid datetime"""
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
 
 
 class DriverViewSet(viewsets.ModelViewSet):
     """ViewSet for Driver operations"""
     queryset = Driver.objects.all()
     serializer_class = DriverSerializer
+    # Without a PAGE_SIZE setting this only paginates when ?limit= is given
+    pagination_class = LimitOffsetPagination
     
     @action(detail=False, methods=['get'], url_path='license/(?P<license_number>[^/.]+)')
     def by_license(self, request, license_number=None):
         """Get driver by license number"""
-        try:
-            driver = Driver.objects.get(license_number=license_number)
-            serializer = self.get_serializer(driver)
-            return Response(serializer.data)
-        except Driver.DoesNotExist:
+        # The serializer reads plain dicts too, so skip building a model instance
+        driver = (
+            Driver.objects.filter(license_number=license_number)
+            .values(*DriverSerializer.Meta.fields)
+            .first()
+        )
+        if driver is None:
             return Response({'error': 'Driver not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(driver)
+        return Response(serializer.data)
     
     @action(detail=True, methods=['get'], url_path='hos-status')
     def hos_status(self, request, pk=None):
         """Get HOS status for a driver"""
         driver = self.get_object()
-        hos_calculator = HOSCalculator()
         
-        # Get latest log for current status
-        latest_log = EldLog.objects.filter(driver=driver).order_by('-log_date').first()
+        # Dashboards poll this; the cached entry is dropped whenever the driver or a log changes
+        cache_key = hos_status_cache_key(driver.pk)
+        hos_status = cache.get(cache_key)
+        if hos_status is not None:
+            return Response(hos_status)
+        
+        # Get latest log for current status; only its hourly entries are needed
+        try:
+            latest_log = EldLog.objects.filter(driver=driver).only('time_entries').latest('log_date')
+        except EldLog.DoesNotExist:
+            latest_log = None
         
         if latest_log and latest_log.time_entries:
-            hos_status = hos_calculator.calculate_hos_status(
+            hos_status = _HOS_CALC.calculate_hos_status(
                 latest_log.time_entries,
                 float(driver.current_cycle_hours)
             )
@@ -57,14 +103,34 @@ class DriverViewSet(viewsets.ModelViewSet):
                 'is_compliant': True
             }
         
-        serializer = HOSStatusSerializer(hos_status)
-        return Response(serializer.data)
+        cache.set(cache_key, hos_status, HOS_STATUS_CACHE_TIMEOUT)
+        # hos_status is already a flat dict of strings and a bool
+        return Response(hos_status)
     
     @action(detail=True, methods=['get'])
     def violations(self, request, pk=None):
         """Get active violations for a driver"""
         driver = self.get_object()
-        violations = HosViolation.objects.filter(driver=driver, resolved=False).order_by('-timestamp')
+        open_violations = HosViolation.objects.filter(driver=driver, resolved=False)
+        
+        if _query_flag(request, 'summary'):
+            # Counted in the database; order_by() drops the default ordering from the GROUP BY
+            by_severity = dict(
+                open_violations.order_by().values_list('severity').annotate(Count('id'))
+            )
+            return Response({'total': sum(by_severity.values()), 'by_severity': by_severity})
+        
+        violations = (
+            open_violations
+            .select_related('driver', 'trip__driver')
+            .defer('trip__route_geometry_packed')
+            .order_by('-timestamp')
+        )
+        page = self.paginate_queryset(violations)
+        if page is not None:
+            serializer = HosViolationSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
         serializer = HosViolationSerializer(violations, many=True)
         return Response(serializer.data)
     
@@ -72,7 +138,12 @@ class DriverViewSet(viewsets.ModelViewSet):
     def trips(self, request, pk=None):
         """Get trips for a driver"""
         driver = self.get_object()
-        trips = Trip.objects.filter(driver=driver).order_by('-created_at')
+        trips = (
+            Trip.objects.filter(driver=driver)
+            .select_related('driver')
+            .defer('route_geometry_packed')
+            .order_by('-created_at')
+        )
         serializer = TripSerializer(trips, many=True)
         return Response(serializer.data)
     
@@ -83,26 +154,56 @@ class DriverViewSet(viewsets.ModelViewSet):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        queryset = EldLog.objects.filter(driver=driver)
+        queryset = (
+            EldLog.objects.filter(driver=driver)
+            .select_related('driver', 'trip__driver')
+            .defer(*LOG_LIST_DEFERRED_FIELDS)
+        )
         
         if start_date:
-            start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            queryset = queryset.filter(log_date__gte=start_date)
+            start = _parse_dt(start_date)
+            if start is None:
+                return Response({'error': 'Invalid start_date'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(log_date__gte=start)
         
         if end_date:
-            end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            queryset = queryset.filter(log_date__lte=end_date)
+            end = _parse_dt(end_date)
+            if end is None:
+                return Response({'error': 'Invalid end_date'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(log_date__lte=end)
         
         logs = queryset.order_by('-log_date')
-        serializer = EldLogSerializer(logs, many=True)
+        
+        # Long histories should be paged with ?limit=&offset=, which is what bounds the
+        # response size; without it every matching log is returned
+        page = self.paginate_queryset(logs)
+        if page is not None:
+            serializer = EldLogListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = EldLogListSerializer(logs, many=True)
         return Response(serializer.data)
 
 
 class TripViewSet(viewsets.ModelViewSet):
     """ViewSet for Trip operations"""
-    queryset = Trip.objects.all()
+    queryset = Trip.objects.select_related('driver')
     serializer_class = TripSerializer
     
+    def get_queryset(self):
+        """Skip the heavy route columns unless the action returns them"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.defer('route_data', 'route_geometry_packed')
+        if self.action != 'geometry':
+            return queryset.defer('route_geometry_packed')
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return TripListSerializer
+        return super().get_serializer_class()
+    
     def perform_create(self, serializer):
         """Create trip with driver lookup"""
         driver_id = self.request.data.get('driver_id')
@@ -112,26 +213,36 @@ class TripViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def calculate(self, request):
         """Calculate route and generate ELD logs"""
-        serializer = TripCalculationSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response({'error': 'Invalid trip data', 'details': serializer.errors}, 
+        try:
+            data = TRIP_CALC_SERIALIZER.run_validation(request.data)
+        except serializers.ValidationError as e:
+            return Response({'error': 'Invalid trip data', 'details': e.detail}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        data = serializer.validated_data
+        # Fetched once, before any external calls; this instance is attached to the trip, logs
+        # and violations, so serializing them never re-queries the driver. All columns are
+        # loaded because the nested DriverSerializer reads every one of them.
+        driver = get_object_or_404(Driver, id=data['driver_id'])
         
         try:
-            # Get driver
-            driver = get_object_or_404(Driver, id=data['driver_id'])
-            
             # Calculate route
-            route_calculator = RouteCalculator()
-            route_data = route_calculator.calculate_route(
+            route_data = _ROUTE_CALC.calculate_route(
                 data['current_location'],
                 data['pickup_location'],
                 data['dropoff_location']
             )
-            
-            # Create trip record
+        except RouteCalculationError as e:
+            # Route failures carry their own user-facing messages; anything else is a 500
+            return Response({
+                'error': e.title,
+                'details': e.user_message,
+                'original_error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Write the trip, its logs and violations together, or not at all
+        with transaction.atomic():
+            # Create trip record; the geometry is stored packed, apart from the route summary
+            route_summary = {key: value for key, value in route_data.items() if key != 'coordinates'}
             trip = Trip.objects.create(
                 driver=driver,
                 current_location=data['current_location'],
@@ -140,17 +251,17 @@ class TripViewSet(viewsets.ModelViewSet):
                 estimated_weight=data['estimated_weight'],
                 total_distance=route_data['total_distance'],
                 estimated_duration=route_data['estimated_duration'],
-                route_data=route_data
+                route_data=route_summary,
+                route_geometry_packed=pack_coordinates(route_data['coordinates'])
             )
-            
+        
             # Generate ELD logs
-            eld_log_generator = ELDLogGenerator()
             driving_hours = route_data['estimated_duration'] / 60  # Convert minutes to hours
             start_time = timezone.now()
-            
+        
             if driving_hours > 11:
                 # Multi-day trip
-                eld_logs_data = eld_log_generator.generate_multi_day_logs(
+                log_drafts = _ELD_GEN.generate_multi_day_logs(
                     start_time,
                     route_data['total_distance'],
                     driving_hours,
@@ -159,110 +270,116 @@ class TripViewSet(viewsets.ModelViewSet):
                 )
             else:
                 # Single day trip
-                single_log = eld_log_generator.generate_log_for_trip(
+                log_drafts = [_ELD_GEN.generate_log_for_trip(
                     start_time,
                     route_data['total_distance'],
                     driving_hours
-                )
-                eld_logs_data = [{
-                    'date': start_time,
-                    'daily_miles': route_data['total_distance'],
-                    **single_log
-                }]
-            
-            # Store ELD logs in database
-            saved_logs = []
-            for log_data in eld_logs_data:
-                eld_log = EldLog.objects.create(
-                    driver=driver,
-                    trip=trip,
-                    log_date=log_data['date'],
-                    total_miles=log_data['daily_miles'],
-                    driving_time=log_data['driving_time'],
-                    on_duty_time=log_data['on_duty_time'],
-                    off_duty_time=log_data['off_duty_time'],
-                    sleeper_berth_time=log_data['sleeper_berth_time'],
-                    time_entries=log_data['time_entries'],
-                    remarks='\n'.join(log_data['remarks']),
-                    is_compliant=log_data['is_compliant']
-                )
-                saved_logs.append(eld_log)
-            
+                )]
+        
+            # Store ELD logs in batched INSERTs; bulk_create builds every day's row before the first one
+            saved_logs = EldLog.objects.bulk_create(
+                (
+                    EldLog(
+                        driver=driver,
+                        trip=trip,
+                        log_date=draft.date,
+                        total_miles=draft.daily_miles,
+                        driving_time=draft.driving_time,
+                        on_duty_time=draft.on_duty_time,
+                        off_duty_time=draft.off_duty_time,
+                        sleeper_berth_time=draft.sleeper_berth_time,
+                        time_entries=draft.time_entries,
+                        remarks=draft.remarks,
+                        is_compliant=draft.is_compliant
+                    )
+                    for draft in log_drafts
+                ),
+                batch_size=100
+            )
+        
             # Calculate HOS status
-            hos_calculator = HOSCalculator()
-            current_time_entries = eld_logs_data[0]['time_entries'] if eld_logs_data else []
-            hos_status = hos_calculator.calculate_hos_status(
+            current_time_entries = saved_logs[0].time_entries if saved_logs else []
+            hos_status = _HOS_CALC.calculate_hos_status(
                 current_time_entries, 
                 float(data['current_cycle_hours'])
             )
-            
+        
             # Check for violations
-            violations_data = hos_calculator.calculate_violations(
+            violations_data = _HOS_CALC.calculate_violations(
                 current_time_entries, 
                 float(data['current_cycle_hours'])
             )
-            
-            saved_violations = []
-            for violation in violations_data:
-                hos_violation = HosViolation.objects.create(
-                    driver=driver,
-                    trip=trip,
-                    violation_type=violation['type'],
-                    description=violation['description'],
-                    severity=violation['severity']
-                )
-                saved_violations.append(hos_violation)
-            
-            # Serialize response data
-            trip_serializer = TripSerializer(trip)
-            eld_logs_serializer = EldLogSerializer(saved_logs, many=True)
-            violations_serializer = HosViolationSerializer(saved_violations, many=True)
-            hos_status_serializer = HOSStatusSerializer(hos_status)
-            
-            return Response({
-                'trip': trip_serializer.data,
-                'route': route_data,
-                'eld_logs': eld_logs_serializer.data,
-                'hos_status': hos_status_serializer.data,
-                'violations': violations_serializer.data
-            })
-            
-        except Exception as e:
-            # Provide more specific error messages
-            error_message = "Failed to calculate route"
-            user_friendly_message = "Please check your locations and try again"
-            
-            error_str = str(e)
-            if "Could not find location" in error_str:
-                error_message = "Location not found"
-                user_friendly_message = "One or more locations could not be found. Please check spelling and try common city names."
-            elif "Geocoding failed" in error_str:
-                error_message = "Address lookup service temporarily unavailable" 
-                user_friendly_message = "Our address lookup service is temporarily busy. Please try again in a moment or use major city names."
-            elif "No route found" in error_str:
-                error_message = "No route available"
-                user_friendly_message = "No driving route could be found between these locations. Please check the addresses."
-            
-            return Response({
-                'error': error_message,
-                'details': user_friendly_message,
-                'original_error': error_str
-            }, status=status.HTTP_400_BAD_REQUEST)
+        
+            saved_violations = HosViolation.objects.bulk_create(
+                [
+                    HosViolation(
+                        driver=driver,
+                        trip=trip,
+                        violation_type=violation['type'],
+                        description=violation['description'],
+                        severity=violation['severity']
+                    )
+                    for violation in violations_data
+                ],
+                batch_size=100
+            )
+        
+        # bulk_create skips post_save, so drop the cached HOS status here
+        cache.delete(hos_status_cache_key(driver.pk))
+        
+        # Serialize response data
+        trip_serializer = TripSerializer(trip)
+        eld_logs_serializer = EldLogSerializer(saved_logs, many=True)
+        violations_serializer = HosViolationSerializer(saved_violations, many=True)
+        
+        return Response({
+            'trip': trip_serializer.data,
+            # The polyline is most of the payload; clients fetch it from the geometry
+            # action unless they ask for it inline with ?include_geometry=1
+            'route': route_data if _query_flag(request, 'include_geometry') else route_summary,
+            'eld_logs': eld_logs_serializer.data,
+            'hos_status': hos_status,
+            'violations': violations_serializer.data
+        })
+    
+    @action(detail=True, methods=['get'])
+    def geometry(self, request, pk=None):
+        """Get the route coordinates for a trip"""
+        trip = self.get_object()
+        packed = trip.route_geometry_packed
+        return Response({'coordinates': unpack_coordinates(packed) if packed else []})
     
     @action(detail=True, methods=['get'])
     def logs(self, request, pk=None):
         """Get ELD logs for a trip"""
         trip = self.get_object()
-        logs = EldLog.objects.filter(trip=trip).order_by('-log_date')
-        serializer = EldLogSerializer(logs, many=True)
+        logs = (
+            EldLog.objects.filter(trip=trip)
+            .select_related('driver', 'trip__driver')
+            .defer(*LOG_LIST_DEFERRED_FIELDS)
+            .order_by('-log_date')
+        )
+        serializer = EldLogListSerializer(logs, many=True)
         return Response(serializer.data)
 
 
 class EldLogViewSet(viewsets.ModelViewSet):
     """ViewSet for ELD Log operations"""
-    queryset = EldLog.objects.all()
+    queryset = EldLog.objects.select_related('driver', 'trip__driver').defer('trip__route_geometry_packed')
     serializer_class = EldLogSerializer
     
+    def get_queryset(self):
+        """Skip the hourly entries, remarks and trip route on list views"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.defer(*LOG_LIST_DEFERRED_FIELDS)
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EldLogListSerializer
+        return super().get_serializer_class()
+    
     def perform_create(self, serializer):
         """Create ELD log with driver and trip lookup"""
         driver_id = self.request.data.get('driver_id')
@@ -281,15 +398,14 @@ class EldLogViewSet(viewsets.ModelViewSet):
         log = self.get_object()
         driver = log.driver
         
-        eld_log_generator = ELDLogGenerator()
-        pdf_data = eld_log_generator.export_to_pdf_data({
+        pdf_data = _ELD_GEN.export_to_pdf_data({
             'date': log.log_date,
             'time_entries': log.time_entries,
             'driving_time': log.driving_time,
             'on_duty_time': log.on_duty_time,
             'off_duty_time': log.off_duty_time,
             'sleeper_berth_time': log.sleeper_berth_time,
-            'remarks': log.remarks.split('\n') if log.remarks else [],
+            'remarks': log.remarks,
             'daily_miles': float(log.total_miles)
         }, driver.name)
         
@@ -298,7 +414,7 @@ class EldLogViewSet(viewsets.ModelViewSet):
 
 class HosViolationViewSet(viewsets.ModelViewSet):
     """ViewSet for HOS Violation operations"""
-    queryset = HosViolation.objects.all()
+    queryset = HosViolation.objects.select_related('driver', 'trip__driver').defer('trip__route_geometry_packed')
     serializer_class = HosViolationSerializer
     
     def perform_create(self, serializer):
@@ -316,7 +432,11 @@ class HosViolationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'])
     def resolve(self, request, pk=None):
         """Resolve a violation"""
-        violation = self.get_object()
-        violation.resolved = True
-        violation.save()
+        # A single UPDATE of the one column, without loading the row first
+        try:
+            updated = HosViolation.objects.filter(pk=pk).update(resolved=True)
+        except DjangoValidationError:
+            updated = 0  # not a valid UUID
+        if not updated:
+            return Response({'error': 'Violation not found'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'success': True})
\ No newline at end of file